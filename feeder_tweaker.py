@@ -1,16 +1,40 @@
-import re
 import sys
+import json
+import os
+import operator
+import functools
+import math
+import time
+import threading
+import queue
 import serial
-import serial.tools.list_ports
 import atexit
-import time
-import msvcrt
+
+try:
+    import orjson   # Optional C encoder/decoder for the feeders file.
+except ImportError:
+    orjson = None
 
 # Naughty global variables
 _feeder_enabled = False
 _feeder_address = None
 _current_angle = 180    # Default starting and resting angle for servos.
 serial_port = None
+_serial_lock = threading.Lock()     # Serializes port access between the UI and the jog writer thread.
+_jog_queue = queue.SimpleQueue()    # M603 moves waiting for the jog writer thread.
+_jog_thread = None
+_feeders = {}   # Every Feeder known to the tuner, keyed by feeder id.
+
+_FEEDERS_FILE = "feeders.json"
+
+_MAX_PIPELINED_BYTES = 64       # Bytes written ahead of their replies; the Arduino's serial receive buffer holds 64.
+_MAX_RESPONSE_BYTES = 256       # Upper bound on a single firmware reply line.
+_RESPONSE_DEADLINE = 2.0        # Seconds a command may keep replying before it is treated as timed out.
+
+# Fixed M-codes, built once instead of at every call site.
+_STARTUP_COMMANDS = ("G21", "G90", "M610 S1", "M611 S0")
+_ENABLE_FEEDERS = "M611 S1"
+_DISABLE_FEEDERS = "M611 S0"
 
 class Feeder:
     '''
@@ -28,91 +52,226 @@ class Feeder:
         W	pulsewidth at which servo is at about 180°, defaults to FEEDER_DEFAULT_MOTOR_MAX_PULSEWIDTH
         X	ignore feedback pin, defaults to FEEDER_DEFAULT_IGNORE_FEEDBACK
     '''
+    # Fixed attribute layout; feeders are plain records, so skip the per-instance __dict__.
+    __slots__ = ('id', '_advance_angle', '_half_advance_angle', '_retract_angle',
+                 'default_feed_length', 'settle_time', 'current_angle', '_cached_dict')
+
+    # (attribute, persisted name) pairs written by to_dictionary. current_angle is not persistent.
+    _PERSIST_KEYS = (('id', 'id'),
+                     ('_advance_angle', 'advance_angle'),
+                     ('_half_advance_angle', 'half_advance_angle'),
+                     ('_retract_angle', 'retract_angle'),
+                     ('default_feed_length', 'default_feed_length'),
+                     ('settle_time', 'settle_time'))
+    _PERSIST_ATTRS = frozenset(attr_name for attr_name, _ in _PERSIST_KEYS)
+    _PERSIST_NAMES = tuple(json_name for _, json_name in _PERSIST_KEYS)
+    _PERSIST_GETTER = operator.attrgetter(*(attr_name for attr_name, _ in _PERSIST_KEYS))
+
     def __init__(self) -> None:
+        self._cached_dict = None
         self.id = None
         # self.model = None
         # self.body_width = None    # width in millimeters 
         # self.tape_width = None   # tape width in millimeters
         # self.min_pitch = None   # component pitch in millimeters
-        self.advance_angle = None
-        self.half_advance_angle = None
-        self.retract_angle = None
+        self._advance_angle = None
+        self._half_advance_angle = None
+        self._retract_angle = None
         self.default_feed_length = None
-        self.settle_time = None
+        self.settle_time = None     # TODO: Add error checking based on acceptable time values in feeder firmware
         # The following are advanced configuration parameters
         # self.control_min_pulsewidth = None    
         # self.control_max_pulsewidth = None
         # self.feedback_pin_monitored = False
         self.current_angle = None   # This angle is not persistent
 
+    def __setattr__(self, name, value):
+        if name in Feeder._PERSIST_ATTRS:   # A persisted field changed, so the cached dictionary is stale.
+            object.__setattr__(self, '_cached_dict', None)
+        object.__setattr__(self, name, value)
+
     def to_dictionary(self):
-        '''Convert a feeder to a dictionary'''
-        feeder_dictionary = vars(self)
-        print(feeder_dictionary)
-        return
+        '''Convert a feeder to a dictionary. The result is cached; treat it as read-only.'''
+        if self._cached_dict is None:
+            self._cached_dict = dict(zip(self._PERSIST_NAMES, self._PERSIST_GETTER(self)))
+        return self._cached_dict
 
     @classmethod
     def from_dictionary(cls, data):
         '''Create a feeder instance from a dictionary'''
-        feeder = cls()
-        feeder.__dict__.update(data)
+        feeder = object.__new__(cls)     # Skip __init__: fill every slot once directly instead.
+        for name in cls.__slots__:
+            object.__setattr__(feeder, name, None)
+        for key in cls._PERSIST_NAMES:      # Only persisted fields; other keys in the file are ignored.
+            if key in data:
+                setattr(feeder, key, data[key])     # Go through the setters so angles are normalized.
         return feeder
         
     @staticmethod
     def _normalize_angle(angle):
+        if angle is None:   # Not tuned yet.
+            return None
+        if isinstance(angle, bool) or not isinstance(angle, (int, float)) or not math.isfinite(angle):
+            raise ValueError(f"invalid angle {angle!r}")    # e.g. a string, or 1e400 parsed to inf.
+        if 0 <= angle < 360:
+            return angle
         return angle % 360  # Normalize angle to be within 0-359 degrees.
     
     @property
     def advance_angle(self):
-        return self.advance_angle
+        return self._advance_angle
     
     @advance_angle.setter
     def advance_angle(self, angle):
-        self.advance_angle = Feeder.normalize_angle(angle)
+        self._advance_angle = Feeder._normalize_angle(angle)
         
     @property
     def half_advance_angle(self):
-        return self.half_advance_angle
+        return self._half_advance_angle
     
     @half_advance_angle.setter
     def half_advance_angle(self, angle):
-        self.half_advance_angle = Feeder._normalize_angle(angle)
+        self._half_advance_angle = Feeder._normalize_angle(angle)
 
     @property
     def retract_angle(self):
-        return self.retract_angle
+        return self._retract_angle
     
     @retract_angle.setter
     def retract_angle(self, angle):
-        self.retract_angle = Feeder._normalize_angle(angle)
+        self._retract_angle = Feeder._normalize_angle(angle)
 
-    @property
-    def settle_time(self):
-        return self.settle_time
-    
-    @settle_time.setter
-    def settle_time(self, time):
-        self.settle_time = time     # TODO: Add error checking based on acceptable time values in feeder firmware
+def list_feeders():
+    """Print a table of all feeders and their tuning parameters."""
+    if not _feeders:
+        print("No feeders loaded.")
+        return
+
+    rows = [Feeder._PERSIST_GETTER(feeder) for feeder in _feeders.values()]    # One attrgetter call per feeder.
+    columns = Feeder._PERSIST_NAMES
+    # Transpose to columns so widths come from one C-level max(map(len, ...)) per column.
+    col_strs = {col: list(map(str, values)) for col, values in zip(columns, zip(*rows))}
+    column_widths = {col: max(len(col), max(map(len, values))) for col, values in col_strs.items()}
+
+    header_row = " | ".join(f"{col:{column_widths[col]}}" for col in columns)
+    lines = [header_row, "-" * len(header_row)]
+    lines.extend(" | ".join(f"{col_strs[col][row]:{column_widths[col]}}" for col in columns)
+                 for row in range(len(rows)))
+    sys.stdout.write("\n".join(lines) + "\n")   # One write for the whole table.
+
+def save_feeders_to_file(filename=_FEEDERS_FILE):
+    """Save the tuning parameters of all feeders to a JSON file."""
+    feeders_data = [feeder.to_dictionary() for feeder in _feeders.values()]
+    # Encode the whole document up front so it goes to disk in a single write. Always the stdlib encoder,
+    # so feeders.json comes out byte-identical whether or not orjson is installed.
+    encoded = json.dumps(feeders_data, indent=2).encode('utf-8')
+
+    # Write beside the target and rename over it, so a crash mid-write can't truncate the saved feeders.
+    temp_filename = filename + ".tmp"
+    try:
+        with open(temp_filename, 'wb') as file:
+            file.write(encoded)
+            file.flush()
+            os.fsync(file.fileno())     # On disk before the rename, or a power loss can leave an empty file.
+        os.replace(temp_filename, filename)
+    except OSError as e:
+        try:
+            os.remove(temp_filename)    # Don't leave a partial .tmp behind, e.g. after a full disk.
+        except OSError:
+            pass
+        print(f"Failed to save feeders to {filename}: {e}")
+        return
+    _parse_feeders_file.cache_clear()   # Don't trust mtime granularity to spot our own write.
+    print(f"Saved {len(feeders_data)} feeders to {filename}.")
+
+@functools.lru_cache(maxsize=8)
+def _parse_feeders_file(filename, mtime_ns, size):
+    """Read and parse a feeders file. Keyed on mtime and size, so an unchanged file is parsed only once."""
+    with open(filename, 'rb') as file:
+        raw = file.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def load_feeders_from_file(filename=_FEEDERS_FILE):
+    """Load feeders from a JSON file, replacing the feeders currently known."""
+    try:
+        stat = os.stat(filename)
+        feeders_data = _parse_feeders_file(filename, stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        print(f"No feeders file found at {filename}.")
+        return
+    except (OSError, json.JSONDecodeError) as e:    # orjson.JSONDecodeError subclasses json's.
+        print(f"Failed to read feeders from {filename}: {e}")
+        return
+
+    if not isinstance(feeders_data, list) or not all(isinstance(data, dict) for data in feeders_data):
+        print(f"Failed to load feeders from {filename}: expected a list of feeder objects.")
+        return
+    try:
+        # Build every feeder before touching _feeders, so a bad entry leaves the current set intact.
+        feeders = list(map(Feeder.from_dictionary, feeders_data))
+        loaded = {feeder.id: feeder for feeder in feeders}
+    except (AttributeError, TypeError, ValueError) as e:
+        print(f"Failed to load feeders from {filename}: {e}")
+        return
+    # _feeders is keyed by id, so a missing or repeated id would silently drop feeders (and the next save
+    # would delete them from disk). Refuse the file instead.
+    if None in loaded:
+        print(f"Failed to load feeders from {filename}: a feeder has no id.")
+        return
+    if len(loaded) != len(feeders):
+        seen, duplicates = set(), set()
+        for feeder in feeders:
+            (duplicates if feeder.id in seen else seen).add(feeder.id)
+        print(f"Failed to load feeders from {filename}: duplicate ids {', '.join(map(repr, duplicates))}.")
+        return
+
+    _feeders.clear()
+    _feeders.update(loaded)
+    print(f"Loaded {len(_feeders)} feeders from {filename}.")
+
+def _lower_usb_latency(port_name):
+    """On Linux, drop the FTDI latency timer from its 16 ms default to 1 ms so short replies aren't held back."""
+    if not sys.platform.startswith('linux'):
+        return
+    device = os.path.basename(os.path.realpath(port_name))     # Resolve /dev/serial/by-id links to ttyUSBn.
+    path = f"/sys/bus/usb-serial/devices/{device}/latency_timer"
+    try:
+        with open(path, 'w') as f:
+            f.write('1')
+    except FileNotFoundError:
+        pass    # Not a usb-serial adapter with a latency timer.
+    except OSError as e:
+        print(f"Could not lower the USB latency timer for {port_name}: {e}")
 
 def open_serial_port(port_name):
     global serial_port
     """Open the selected COM port."""
     
     try:
-        serial_port = serial.Serial(port=port_name,
-                                    baudrate=19200,
+        # Configure before opening so pyserial opens with DTR/RTS low; toggling DTR resets the Arduino (~2 s).
+        # This avoids the reset on Windows only: on POSIX the kernel raises DTR when the tty opens, before
+        # dtr=False is applied, so the board still resets there unless HUPCL is cleared on the device.
+        serial_port = serial.Serial(baudrate=19200,
                                     bytesize=8,
                                     parity=serial.PARITY_NONE,
                                     stopbits=serial.STOPBITS_ONE,
-                                    timeout=1)
-        
+                                    timeout=0.15,             # Replies arrive within a few ms; don't stall a full second.
+                                    write_timeout=0.5,        # Fail instead of hanging on a wedged device.
+                                    inter_byte_timeout=0.02)  # Return as soon as the line goes quiet.
+        serial_port.port = port_name
+        serial_port.dtr = False
+        serial_port.rts = False
+        serial_port.open()
+        try:
+            serial_port.set_buffer_size(rx_size=8192, tx_size=8192)    # Windows only.
+        except AttributeError:
+            pass
+        _lower_usb_latency(port_name)
+
         if serial_port.is_open:
             print(f"COM port {port_name} opened successfully.")
             # Now that the port is confirmed open, send initial commands.
-            send_command("G21", handle_ok_response)  # Example commands
-            send_command("G90", handle_ok_response)
-            send_command("M610 S1", handle_ok_response)
-            send_command("M611 S0", handle_ok_response)
+            send_commands(_STARTUP_COMMANDS, handle_ok_response)
         else:
             print(f"Failed to open COM port {port_name}.")
     except serial.SerialException as e:
@@ -121,39 +280,118 @@ def open_serial_port(port_name):
 def close_serial_port():
     global serial_port
     """Close the open serial port."""
-    if serial_port and serial_port.is_open:
-        serial_port.close()
-        print("Serial port closed.")
+    if _jog_thread and _jog_thread.is_alive():
+        _jog_queue.put(None)    # Let queued jog moves finish before the port goes away.
+        _jog_thread.join(timeout=1)
+    with _serial_lock:  # Never close under a writer that is mid-exchange; is_open makes repeat calls no-ops.
+        if serial_port and serial_port.is_open:
+            serial_port.close()
+            print("Serial port closed.")
+
+def _report_jog_error(response):
+    """Reply callback for jog moves: stay quiet on success, since the key loop owns the terminal."""
+    if response.startswith("error"):
+        print(f"\nJog move failed: {response}")
+
+def _jog_writer():
+    """Send queued jog moves, so the jog key loop never waits on a serial round trip."""
+    while True:
+        command = _jog_queue.get()
+        stop = command is None  # Sentinel from close_serial_port.
+        # M603 sets an absolute angle, so moves queued behind each other are superseded; send only the newest.
+        while not _jog_queue.empty():
+            newer = _jog_queue.get_nowait()
+            if newer is None:
+                stop = True
+            else:
+                command = newer
+        if command is not None:
+            send_command(command, _report_jog_error)
+        if stop:
+            return
+
+def queue_jog_command(command):
+    """Hand a jog move to the writer thread, starting it on first use."""
+    global _jog_thread
+    if _jog_thread is None or not _jog_thread.is_alive():
+        _jog_thread = threading.Thread(target=_jog_writer, daemon=True)
+        _jog_thread.start()
+    _jog_queue.put(command)
+
+@functools.lru_cache(maxsize=512)
+def _encode_command(command):
+    """Encode a command as a newline-terminated line. Cached, since jogging resends the same few M-codes."""
+    return f"{command}\n".encode('utf-8')
 
 def send_command(command, response_callback):
-    global serial_port
-    """Send a command to the feeder and handle the response with a callback"""
-    if not serial_port or not serial_port.is_open:
-        print("Serial port not open.")
-        return
-
-    try:
-        serial_port.write(command.encode('utf-8'))
-        print(f"writing to serial: {command}")
-        # Wait for the response
-        time.sleep(0.5)
-        response = serial_port.readline().decode('utf-8').strip()
-        if response:
-            print("got response")
-            response_callback(response)
-        else:
-            print("No response received before timeout.")
-    except serial.SerialException as e:
-        print(f"Failed to send command {command}: {e}")
+    """Send a command to the feeder and handle the response with a callback. Returns True if it replied."""
+    return send_commands([command], response_callback)
+
+def send_commands(commands, response_callback):
+    """Send a batch of commands with as few writes as possible and handle each response, in order, with a callback.
+
+    Returns True once every command has replied, False if the port is closed, a write fails or a reply times out."""
+    with _serial_lock:  # Hold the port for the whole exchange so replies can't be stolen by another thread.
+        if not serial_port or not serial_port.is_open:
+            print("Serial port not open.")
+            return False
+
+        encoded = list(map(_encode_command, commands))
+        start = 0
+        while start < len(commands):
+            # Grow the window while it still fits the receive buffer; a window always holds at least one command.
+            end, size = start + 1, len(encoded[start])
+            while end < len(commands) and size + len(encoded[end]) <= _MAX_PIPELINED_BYTES:
+                size += len(encoded[end])
+                end += 1
+            window = commands[start:end]
+            try:
+                # Drop stale bytes (e.g. a late reply to an earlier timed-out command) so they can't be
+                # mistaken for replies to this window.
+                serial_port.reset_input_buffer()
+                # One write carries the whole window; the replies then stream back in command order.
+                serial_port.write(b"".join(encoded[start:end]))
+                for command in window:
+                    if not read_responses(response_callback):
+                        print(f"No response to {command} received before timeout.")
+                        return False
+            except serial.SerialException as e:
+                print(f"Failed to send commands {', '.join(window)}: {e}")
+                return False
+            start = end
+        return True
+
+def read_responses(response_callback):
+    """Hand each reply line of one command to the callback, up to the closing ok/error line.
+
+    Returns False if the port timed out before the command finished replying."""
+    # Bind the per-line calls once; the loop runs for every reply line of every command.
+    read_until = serial_port.read_until
+    monotonic = time.monotonic
+    # The port timeout bounds each line; the deadline bounds the whole reply, so a device that keeps
+    # chattering without ever sending ok/error can't hold the port forever.
+    deadline = monotonic() + _RESPONSE_DEADLINE
+    while True:
+        line = read_until(b'\n', _MAX_RESPONSE_BYTES)  # read_until accumulates the bytes inside pyserial.
+        if not line:    # Nothing arrived before the port timeout.
+            return False
+        response = line.strip()
+        if response:    # Blank lines inside a reply are not a timeout; skip them.
+            response_callback(response.decode('ascii', 'replace'))
+            if response.startswith((b"ok", b"error")):    # Test the terminator on the raw bytes.
+                return True
+        # Only give up once the line in hand has been handled, so a late closing ok still counts.
+        if monotonic() > deadline:
+            return False
 
 def handle_ok_response(response):
-    if re.match(r"^ok.*", response):
+    if response.startswith("ok"):
         print("Operation successful.")
     else:
         print("Unexpected response.", response)
 
 def handle_error_response(response):
-    if re.match(r"^error.*", response):
+    if response.startswith("error"):
         print("Operation failed.")
     else:
         print("Unexpected response.", response)
@@ -168,25 +406,37 @@ def check_feeder():
     if _feeder_address is None:
         print("No feeder address selected.")
         return
-    command = f"M602 N{_feeder_address}"
-    send_command("M602", handle_ok_response)
-    response = "Feeder reports OK"
-    if re.match(r"^ok.*", response):
-        print("Feeder is OK.")
-    else:
-        print("Feeder reports an error.")
+    def report_status(response):
+        if response.startswith("ok"):
+            print("Feeder is OK.")
+        elif response.startswith("error"):
+            print("Feeder reports an error.")
+
+    # Judge the feeder by its actual reply to M602 for this address.
+    send_command(f"M602 N{_feeder_address}", report_status)
 
 def enable_disable_feeders():
     """Enable or disable all feeders."""
-    send_command("M611 S1", handle_ok_response)
-    print("Enabled all feeders")
+    global _feeder_enabled
+    enable = not _feeder_enabled     # Start-up sends M611 S0, so the first call enables.
+    replies = []
+    # Only record the new state once the controller has accepted it, so the next toggle still matches the hardware.
+    if send_command(_ENABLE_FEEDERS if enable else _DISABLE_FEEDERS, replies.append) and replies[-1].startswith("ok"):
+        _feeder_enabled = enable
+        print("Enabled all feeders" if enable else "Disabled all feeders")
+    else:
+        print(f"Failed to {'enable' if enable else 'disable'} feeders; they stay {'disabled' if enable else 'enabled'}.")
     
+def _valid_address(address):
+    """Check for board 0-4 followed by a two-digit position 00-12, using plain string compares."""
+    return len(address) == 3 and address.isascii() and address.isdigit() and address[0] <= '4' and int(address[1:]) <= 12
+
 def select_feeder_address():
     """Select a feeder address."""
     global _feeder_address
     address = input("Enter 3-digit feeder address (e.g., 003 for board 0, position 3): ")
     # Validate and set feeder address
-    if re.match(r"^[0-4](0[0-9]|1[0-2])$", address):
+    if _valid_address(address):
         _feeder_address = address
         print(f"Feeder address{_feeder_address} selected.")
         # check_feeder()
@@ -195,106 +445,160 @@ def select_feeder_address():
 
 
 def jog_windows():
+    import msvcrt   # Windows-only and only needed here, so import it on first use.
+
     command_mode = True # Start command mode.
 
-    print("Jog Mode: Use keys to adjust angle ('e' to exit, 'h' for help).")
+    print("Jog Mode: Use keys to adjust angle ('e' to exit, '?' for help).")
     print("Enter numbers directly for absolute angles, prefix with '+' or '-' for relative movement.")
 
-    input_buffer = ""   # Buffer for numeric input
+    input_buffer = bytearray()  # Buffer for numeric input, appended in place
+    pending_key = None  # Key read ahead while coalescing jog steps, handled on the next pass.
 
     while True:
-        if msvcrt.kbhit():
-            key = msvcrt.getch().decode('utf-8')
-
-            if command_mode:
-                if key.lower() == 'e':  # Exit jog mode
-                    print("Exiting jog mode.")
-                elif key.lower() == 'h':  # Show help
-                    print_help()
-                elif key in '.,<>ofhrFHR':  # Single key commands
-                    handle_command(key)
-                elif key.isdigit() or key in '+-':  # Start of numeric input
-                        command_mode = False
-                        input_buffer += key
-                        print(f"Angle input: {input_buffer}, end='\r")
-                else:
-                    print("Unknown command. Press 'h' for help.")
-            else:   # Numeric input mode
-                if key == '\r':  # Enter key
-                    handle_numeric_input(input_buffer)
-                    input_buffer = ""   # Clear buffer
-                    command_mode = True # Switch back to command mode
-                elif key.isdigit() or (key in '+-' and not input_buffer):
-                    input_buffer += key
-                    print(f"Angle input: {input_buffer}", end='\r')
-                elif key == '\x08':  # Handle backspace
-                    input_buffer = input_buffer[:-1]
-                    print(f"Angle input: {input_buffer}", end='\r')
-                else:
-                    print("\nInvalid input. Returning to command mode.")
-                    input_buffer = ""
-                    command_mode = True
+        if pending_key is None:
+            key = msvcrt.getwch()    # Blocks until a key is pressed, so the loop doesn't spin while idle.
+        else:
+            key, pending_key = pending_key, None
+        if key in ('\x00', '\xe0'):  # Arrow and function keys arrive as a prefix plus a code; ignore them.
+            msvcrt.getwch()
+            continue
+
+        if command_mode:
+            if key.lower() == 'e':  # Exit jog mode
+                print("Exiting jog mode.")
+                return
+            elif key == '?':  # Show help. Not 'h': h/H are jog commands in _JOG_COMMANDS.
+                print_help()
+            elif key in _JOG_STEPS:  # Relative jog: fold keys already queued (e.g. autorepeat) into one move.
+                step = _JOG_STEPS[key]
+                while msvcrt.kbhit():
+                    next_key = msvcrt.getwch()
+                    if next_key not in _JOG_STEPS:
+                        pending_key = next_key
+                        break
+                    step += _JOG_STEPS[next_key]
+                if step:
+                    adjust_angle_by(step)
+            elif key in _JOG_COMMANDS:  # Single key commands
+                handle_command(key)
+            elif key in _DIGIT_KEYS or key in _SIGN_KEYS:  # Start of numeric input
+                command_mode = False
+                input_buffer.append(ord(key))
+            else:
+                print("Unknown command. Press '?' for help.")
+        else:   # Numeric input mode
+            if key == '\r':  # Enter key
+                handle_numeric_input(input_buffer.decode())
+                input_buffer.clear()    # Clear buffer
+                command_mode = True # Switch back to command mode
+            elif key in _DIGIT_KEYS or (key in _SIGN_KEYS and not input_buffer):
+                input_buffer.append(ord(key))
+            elif key == '\x08':  # Handle backspace
+                del input_buffer[-1:]
+            else:
+                print("\nInvalid input. Returning to command mode.")
+                input_buffer.clear()
+                command_mode = True
+
+        # Redraw the numeric entry once pending keys are drained rather than on every keystroke.
+        if not command_mode and not msvcrt.kbhit():
+            sys.stdout.write(f"Angle input: {input_buffer.decode():<16}\r")
+            sys.stdout.flush()
+
+def set_angle(angle):
+    '''Move the servo to an absolute angle.'''
+    global _current_angle
+
+    if angle >= 360 or angle < 0:  # Jog steps rarely wrap, so skip the modulo when in range.
+        angle %= 360
+    _current_angle = angle
+
+    queue_jog_command(f"M603N{_feeder_address}A{_current_angle}")
+    print(f"Servo angle set to {_current_angle} degrees.")
+
+def adjust_angle_by(delta):
+    '''Move the servo relative to its current angle.'''
+    set_angle((180 if _current_angle is None else _current_angle) + delta)
+
+def adjust_angle(input_str):
+    '''Adjust the servo angle based on the provided input string.'''
+    try:
+        angle = int(input_str)
+    except ValueError:
+        print("Invalid angle. enter a valid angle (0-360, or +/- for relative adjustment).")
+        return
+
+    if input_str.startswith(("+", "-")):
+        adjust_angle_by(angle)
+    else:
+        set_angle(angle)
+
+# Jog mode single-key commands: key -> (help text, action, argument). The angle is parsed here once,
+# not on every keystroke. Keys without an action yet only show in help.
+_JOG_COMMANDS = {
+    '.': ("jog cw 1 degree", adjust_angle_by, 1),
+    ',': ("jog ccw 1 degree", adjust_angle_by, -1),
+    '>': ("jog cw 5 degrees", adjust_angle_by, 5),
+    '<': ("jog ccw 5 degrees", adjust_angle_by, -5),
+    'o': ("return to origin (180°)", set_angle, 180),
+    'F': ("set current position as full advance", None, None),
+    'H': ("set current position as half advance", None, None),
+    'R': ("set current position as retract angle", None, None),
+    'f': ("jog to currently set full advance angle", None, None),
+    'h': ("jog to currently set half advance angle", None, None),
+    'r': ("jog to currently set retract angle", None, None),
+}
+
+# Relative jog keys -> step in degrees, so queued keystrokes can be summed into a single M603.
+_JOG_STEPS = {key: step for key, (_, action, step) in _JOG_COMMANDS.items() if action is adjust_angle_by}
+
+_SIGN_KEYS = frozenset('+-')    # Keys that start a relative angle entry.
+_DIGIT_KEYS = frozenset('0123456789')
 
 def handle_command(key):
-    if key in ['.', ',', '>', '<', 'o', 'F', 'H', 'R', 'f', 'h', 'r']:
-        if key == '.':
-            adjust_angle("+1")
-        elif key == ',':
-            adjust_angle("-1")
-        elif key == '>':
-            adjust_angle("+5")
-        elif key == '<':
-            adjust_angle("-5")
-    elif key.isdigit() or key in ['+', '-']:
+    command = _JOG_COMMANDS.get(key)
+    if command is not None:
+        _, action, argument = command
+        if action:
+            action(argument)
+    elif key.isdigit() or key in _SIGN_KEYS:
         print("Switching to numeric input mode for angle adjustment.")
     else:
         print(f"Unknown command: {key}")
 
 
 
-def print_help():
-    help_text = """
+# Built once from _JOG_COMMANDS, so the key list matches the table jog_windows dispatches through.
+_HELP_TEXT = """
     Jog Controls:
-    . - jog cw 1 degree
-    , - jog ccw 1 degree
-    > - jog cw 5 degrees
-    < - jog ccw 5 degrees
-    o - return to origin (180°)
-    F - set current position as full advance
-    H - set current position as half advance
-    R - set current position as retract angle
-    f, h, r - jog to currently set full, half, retract angles
+""" + "".join(f"    {key} - {description}\n" for key, (description, _, _) in _JOG_COMMANDS.items()) + """    ? - show this help
     e - exit jog mode
     Enter numbers directly for absolute angles, prefix with '+' or '-' for relative movement.
     """
-    print(help_text)
+
+def print_help():
+    print(_HELP_TEXT)
 
 
 def handle_numeric_input(input_str):
-    global _current_angle
-    print(f"Setting angle to {input_str} (placeholder action)")
+    print()     # Move off the "Angle input:" line.
+    adjust_angle(input_str)
 
 
     
-def adjust_angle(input_str):
-    '''Adjust the servo angle based on the provided input string.'''
-    global _current_angle
-
-    if _current_angle is None: # Initialize
-        _current_angle = 180
-
-    try:
-        if input_str.startswith(("+", "-")):
-            relative_adjustment = int(input_str)
-            _current_angle = (_current_angle + relative_adjustment) % 360
-        else:
-            _current_angle = int(input_str) % 360
-
-        send_command(f"M603N{_feeder_address}A{_current_angle}", handle_ok_response)
-        print(f"Servo angle set to {_current_angle} degrees.")
-
-    except ValueError:
-        print("Invalid angle. enter a valid angle (0-360, or +/- for relative adjustment).")
+# Main menu entries: (choice, label, action). The printed menu and the dispatch both come from here.
+_MAIN_MENU = (
+    ("1", "Choose feeder by ID", select_feeder_address),
+    ("2", "Enable/disable all feeders?", enable_disable_feeders),
+    ("3", "List feeders", list_feeders),
+    ("4", "Jog feeder servo arm", jog_windows),
+    ("6", "Save feeders to file", save_feeders_to_file),
+    ("7", "Load feeders from file", load_feeders_from_file),
+    ("8", "Exit", None),
+)
+_MAIN_MENU_ACTIONS = {choice: action for choice, _, action in _MAIN_MENU}
+_MAIN_MENU_TEXT = "".join(f"{choice}. {label}\n" for choice, label, _ in _MAIN_MENU) + "Enter your choice: "
 
 def main_menu():
 
@@ -304,34 +608,33 @@ def main_menu():
         print("Specify the communications port as the first argument.")
         sys.exit(1)
    
-    serial_port = open_serial_port(port_name)
+    open_serial_port(port_name)     # Sets the module-level serial_port.
+
+    try:
+        import msvcrt   # Windows: take the menu choice on a single keypress.
+    except ImportError:
+        msvcrt = None
 
     while True:
         current_feeder_id = _feeder_address if _feeder_address else "None"
-        print(f"\nMain Menu - Current feeder ID: {current_feeder_id}")
-        print("1. Choose feeder by ID")
-        print("2. Enable/disable all feeders?")
-        print("4. Jog feeder servo arm")
-        print("6. Save feeders to file")
-        print("7. Load feeders from file")
-        print("8. Exit")
-        choice = input("Enter your choice: ")
-        if choice == "1":
-            select_feeder_address()
-        elif choice == "2":
-            enable_disable_feeders()
-        elif choice == "4":
-            jog_windows()
-        elif choice == "6":
-            pass
-            # save_feeders_to_file()
-        elif choice == "7":
-            pass
-            # load_feeders_from_file()
-        elif choice == "8":
-            break
+        # Only the header changes between redraws; the rest of the menu is prebuilt and written in one go.
+        sys.stdout.write(f"\nMain Menu - Current feeder ID: {current_feeder_id}\n{_MAIN_MENU_TEXT}")
+        sys.stdout.flush()
+        if msvcrt:
+            choice = msvcrt.getwch()
+            if choice in ('\r', '\n', '\x03'):   # Stray Enter or Ctrl-C: just redraw.
+                print()
+                continue
+            print(choice)
         else:
-            print("Invalid choice. Please enter a number between 1 and 8.")
+            choice = input()
+        if choice not in _MAIN_MENU_ACTIONS:
+            print(f"Invalid choice. Please enter one of {', '.join(_MAIN_MENU_ACTIONS)}.")
+            continue
+        action = _MAIN_MENU_ACTIONS[choice]
+        if action is None:  # Exit
+            break
+        action()
 
 
 if __name__ == "__main__":